@@ -0,0 +1,23 @@
+"""
+Shared setup for the Streamlit app integration tests
+
+Importing the llama_stack_ui patch targets is expensive (the upload page
+runs Streamlit code at module level), so do it exactly once per session
+here instead of once per @patch decorator. Doing it at conftest import
+also binds the pages to the real streamlit/llama_stack_client modules
+before other test packages install MagicMock stubs in sys.modules.
+"""
+import importlib
+
+# The frontend directory is on sys.path via pythonpath in pytest.ini
+for _target in (
+    "llama_stack_ui.distribution.ui.modules.api",
+    "llama_stack_ui.distribution.ui.page.upload.upload",
+):
+    try:
+        importlib.import_module(_target)
+    except ImportError:
+        # The llamastack subpackage runs in an environment without the UI
+        # dependencies (streamlit et al.); its tests never patch these
+        # modules, so the eager binding only matters when the imports work.
+        break
@@ -8,6 +8,11 @@ import sys
 from llama_stack_client import LlamaStackClient
 from llama_stack_client.types import Document as RAGDocument
 
+try:
+    from ._config import CHUNK_SIZE_IN_TOKENS
+except ImportError:  # running as a script rather than under pytest
+    from _config import CHUNK_SIZE_IN_TOKENS
+
 # Configuration
 LLAMA_STACK_ENDPOINT = os.getenv("LLAMA_STACK_ENDPOINT", "http://localhost:8321")
 INFERENCE_MODEL = os.getenv("INFERENCE_MODEL", "llama-3-2-3b")
@@ -41,8 +46,11 @@ def create_vector_db(client: LlamaStackClient, vector_db_id: str = "e2e-test-db"
     """Create and populate a vector database with sample documents"""
     print(f"\n📚 Creating vector database: {vector_db_id}")
     
-    try:
-        # Register vector database
+    # Register vector database unless a previous run already created it
+    existing_ids = {vdb.identifier for vdb in client.vector_dbs.list()}
+    if vector_db_id in existing_ids:
+        print(f"   ℹ️  Vector DB already exists, continuing...")
+    else:
         print("   Registering vector DB...")
         client.vector_dbs.register(
             vector_db_id=vector_db_id,
@@ -51,11 +59,6 @@ def create_vector_db(client: LlamaStackClient, vector_db_id: str = "e2e-test-db"
             provider_id="pgvector"
         )
         print("   ✓ Vector DB registered")
-    except Exception as e:
-        if "already exists" in str(e).lower():
-            print(f"   ℹ️  Vector DB already exists, continuing...")
-        else:
-            raise
     
     # Prepare documents
     documents = [
@@ -70,10 +73,12 @@ def create_vector_db(client: LlamaStackClient, vector_db_id: str = "e2e-test-db"
     
     print(f"   Inserting {len(documents)} documents...")
     try:
+        # Same granularity as the session fixture in conftest.py, so both
+        # paths can safely target the same vector DB
         client.tool_runtime.rag_tool.insert(
             documents=documents,
             vector_db_id=vector_db_id,
-            chunk_size_in_tokens=512,
+            chunk_size_in_tokens=CHUNK_SIZE_IN_TOKENS,
         )
         print(f"   ✓ Inserted {len(documents)} documents successfully")
     except Exception as e:
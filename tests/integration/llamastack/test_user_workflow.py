@@ -1,488 +1,180 @@
-#!/usr/bin/env python3
 """
 E2E test for RAG application - simulates a real user workflow
 Tests the complete journey: UI access -> Create vector DB -> Query with RAG
 """
-import os
-import sys
-import time
-import requests
-from openai import OpenAI
-
-# Configuration
-LLAMA_STACK_ENDPOINT = os.getenv("LLAMA_STACK_ENDPOINT", "http://localhost:8321")
-RAG_UI_ENDPOINT = os.getenv("RAG_UI_ENDPOINT", "http://localhost:8501")
-INFERENCE_MODEL = os.getenv("INFERENCE_MODEL", "meta-llama/Llama-3.2-3B-Instruct")
-# Auto-detect if we should skip model tests based on model availability
-SKIP_MODEL_TESTS = os.getenv("SKIP_MODEL_TESTS", "auto").lower()
-MAX_RETRIES = 30
-RETRY_DELAY = 10
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import pytest
+import requests
 
-def wait_for_endpoint(url, name, max_retries=MAX_RETRIES, retry_delay=RETRY_DELAY):
-    """Wait for an endpoint to become available"""
-    print(f"⏳ Waiting for {name} to be ready at {url}...")
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, timeout=5)
-            if response.status_code in [200, 404]:  # 404 is ok for some endpoints
-                print(f"✅ {name} is ready! (attempt {attempt + 1}/{max_retries})")
-                return True
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                print(f"   Attempt {attempt + 1}/{max_retries} failed, retrying in {retry_delay}s...")
-                time.sleep(retry_delay)
-            else:
-                raise Exception(f"{name} not ready after {max_retries} attempts: {str(e)}")
-    return False
+from ._config import wait_for_endpoint
 
 
-def test_chat_completion(client, model_id, skip_inference):
-    """Test chat completion with available model"""
-    if skip_inference:
-        return False
-    
-    print("\n" + "="*80)
-    print("💬 CHAT COMPLETION TEST")
-    print("="*80)
-    
-    test_message = "Say 'Hello from RAG e2e test!' in one short sentence."
-    
-    print(f"\n📤 Sending chat completion request:")
-    print(f"   Model: {model_id}")
-    print(f"   User Query: \"{test_message}\"")
-    print(f"   Max Tokens: 50")
-    print(f"   Temperature: 0.7")
-    
-    try:
-        print("\n⏳ Waiting for model response...")
-        response = client.chat.completions.create(
-            model=model_id,
-            messages=[
-                {"role": "user", "content": test_message}
-            ],
-            max_tokens=50,
-            temperature=0.7
-        )
-        
-        content = response.choices[0].message.content
-        assert content, "No response content from model"
-        
-        print("\n📥 Response received:")
-        print(f"   Model: {response.model if hasattr(response, 'model') else model_id}")
-        print(f"   Content: \"{content}\"")
-        print(f"\n📊 Token usage:")
-        print(f"   Prompt tokens: {response.usage.prompt_tokens}")
-        print(f"   Completion tokens: {response.usage.completion_tokens}")
-        print(f"   Total tokens: {response.usage.total_tokens}")
-        print(f"\n✅ Chat completion test PASSED")
-        print("="*80 + "\n")
-        return True
-    except Exception as e:
-        print(f"\n❌ Chat completion test FAILED")
-        print(f"   Error: {e}")
-        print("="*80 + "\n")
-        return False
-
-
-def test_rag_query_with_vector_db(client, model_id, skip_inference):
-    """Test RAG query by creating a simple vector DB programmatically
-    
-    This creates a test vector DB with sample documents and validates
-    that RAG retrieval works without requiring the OpenShift ingestion pipeline.
-    """
-    if skip_inference:
-        return False
-    
-    print("\n" + "="*80)
-    print("🔍 RAG WITH VECTOR DB TEST")
-    print("="*80)
-    
-    try:
-        from llama_stack_client import LlamaStackClient
-        from llama_stack_client.types import Document as RAGDocument
-        
-        # Initialize llama-stack client for vector DB operations
-        llama_stack_endpoint = os.environ.get("LLAMA_STACK_ENDPOINT", "http://localhost:8321")
-        print(f"\n🔧 Initializing Llama Stack client:")
-        print(f"   Endpoint: {llama_stack_endpoint}")
-        
-        llama_client = LlamaStackClient(base_url=llama_stack_endpoint)
-        
-        vector_db_id = "e2e-test-rag-db"
-        embedding_model = "all-MiniLM-L6-v2"
-        embedding_dim = 384
-        
-        # Sample test documents
-        test_docs = [
-            {
-                "id": "test-1",
-                "content": "The Eiffel Tower is 330 metres tall and was completed in 1889 in Paris, France.",
-            },
-            {
-                "id": "test-2",
-                "content": "Python programming language was created by Guido van Rossum in 1991.",
-            }
-        ]
-        
-        print(f"\n📚 Test documents prepared:")
-        for doc in test_docs:
-            print(f"   [{doc['id']}] {doc['content'][:60]}...")
-        
-        print(f"\n🗄️  Registering vector database:")
-        print(f"   Vector DB ID: {vector_db_id}")
-        print(f"   Embedding Model: {embedding_model}")
-        print(f"   Embedding Dimension: {embedding_dim}")
-        print(f"   Provider: pgvector")
-        
-        # Register vector DB
-        try:
-            llama_client.vector_dbs.register(
-                vector_db_id=vector_db_id,
-                embedding_dimension=embedding_dim,
-                embedding_model=embedding_model,
-                provider_id="pgvector"
-            )
-            print("   ✅ Vector DB registered successfully")
-        except Exception as e:
-            if "already exists" in str(e).lower():
-                print("   ℹ️  Vector DB already exists, reusing...")
-            else:
-                raise
-        
-        # Insert sample documents
-        documents = [
-            RAGDocument(
-                document_id=doc["id"],
-                content=doc["content"],
-                mime_type="text/plain",
-                metadata={"source": "e2e-test"}
-            )
-            for doc in test_docs
-        ]
-        
-        print(f"\n📥 Inserting documents into vector DB:")
-        print(f"   Number of documents: {len(documents)}")
-        print(f"   Chunk size: 512 tokens")
-        
-        llama_client.tool_runtime.rag_tool.insert(
-            documents=documents,
-            vector_db_id=vector_db_id,
-            chunk_size_in_tokens=512,
-        )
-        print("   ✅ Documents inserted and embedded successfully")
-        
-        # Test RAG query
-        test_query = "What is the height of the Eiffel Tower? Give just the number."
-        expected_context = test_docs[0]['content']
-        
-        print(f"\n📤 Sending RAG query:")
-        print(f"   Model: {model_id}")
-        print(f"   User Query: \"{test_query}\"")
-        print(f"   Context Provided: \"{expected_context}\"")
-        print(f"   Max Tokens: 50")
-        print(f"   Temperature: 0.1")
-        
-        print("\n⏳ Waiting for RAG response...")
-        
-        # Use OpenAI client for compatibility
-        response = client.chat.completions.create(
-            model=model_id,
-            messages=[
-                {"role": "system", "content": f"You are a helpful assistant. Answer based on the provided context. Context: {expected_context}"},
-                {"role": "user", "content": test_query}
-            ],
-            max_tokens=50,
-            temperature=0.1
-        )
-        
-        content = response.choices[0].message.content
-        
-        print("\n📥 RAG response received:")
-        print(f"   Content: \"{content}\"")
-        print(f"\n📊 Token usage:")
-        print(f"   Prompt tokens: {response.usage.prompt_tokens}")
-        print(f"   Completion tokens: {response.usage.completion_tokens}")
-        print(f"   Total tokens: {response.usage.total_tokens}")
-        
-        # Check if response contains the answer
-        print(f"\n🔎 Validating response:")
-        print(f"   Expected answer: '330 metres'")
-        print(f"   Response contains '330': {'✅ Yes' if '330' in content else '❌ No'}")
-        
-        if "330" in content:
-            print(f"\n✅ RAG test PASSED - Model successfully retrieved context information!")
-            print("="*80 + "\n")
-            return True
-        else:
-            print(f"\n⚠️  Response didn't contain expected answer")
-            print("   Note: Vector DB creation and query flow worked, but response accuracy needs review")
-            print("✅ Basic RAG flow validated (vector DB creation and querying works)")
-            print("="*80 + "\n")
-            return True
-            
-    except ImportError as e:
-        print(f"\n❌ Missing dependency: {e}")
-        print("   The llama-stack-client package is required for RAG tests")
-        print("="*80 + "\n")
-        return False
-    except Exception as e:
-        print(f"\n❌ RAG test FAILED")
-        print(f"   Error: {e}")
-        print(f"   Note: Vector DB creation requires pgvector backend to be running")
-        print("="*80 + "\n")
-        return False
-
-
-def test_complete_rag_workflow():
+def test_complete_rag_workflow(rag_ui_endpoint, llama_stack_endpoint):
     """
     E2E test simulating a complete user workflow:
     1. User opens the RAG UI
     2. Backend connectivity is verified
     3. Basic health checks pass
-    4. Model inference (if available)
-    5. Chat completion (if models configured)
-    6. RAG query (if models and vector DBs configured)
-    
-    Note: Inference tests require MaaS or llm-service to be configured.
+
+    Inference and RAG queries are covered by test_chat_completion and
+    test_rag_query_with_vector_db below, which share the session-scoped
+    clients from conftest.py.
     """
     print("\n" + "="*80)
     print("E2E Test: RAG Application with MaaS Integration")
     print("="*80 + "\n")
-    
+
+    # Steps 1+2: Wait for the RAG UI and the Llama Stack backend concurrently.
+    # The probes are independent network checks, so total wait time is the
+    # slowest endpoint rather than the sum of all of them.
+    print("📱 Steps 1-2: Waiting for RAG UI and Llama Stack backend...")
+    targets = [
+        (f"{rag_ui_endpoint}/", "RAG UI"),
+        (f"{llama_stack_endpoint}/", "Llama Stack"),
+    ]
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        futures = {
+            executor.submit(wait_for_endpoint, url, name): name
+            for url, name in targets
+        }
+        for future in as_completed(futures):
+            assert future.result(), f"{futures[future]} never became ready"
+
     # Step 1: Verify RAG UI is accessible (simulates user opening the app)
-    print("📱 Step 1: User opens the RAG application...")
-    wait_for_endpoint(f"{RAG_UI_ENDPOINT}/", "RAG UI")
-    response = requests.get(f"{RAG_UI_ENDPOINT}/", timeout=10)
+    response = requests.get(f"{rag_ui_endpoint}/", timeout=10)
     assert response.status_code == 200, f"RAG UI not accessible: {response.status_code}"
     print("✅ RAG UI is accessible\n")
-    
+
     # Step 2: Verify backend service is ready (happens automatically when UI loads)
-    print("🔧 Step 2: UI connects to Llama Stack backend...")
-    wait_for_endpoint(f"{LLAMA_STACK_ENDPOINT}/", "Llama Stack")
-    response = requests.get(f"{LLAMA_STACK_ENDPOINT}/", timeout=10)
+    response = requests.get(f"{llama_stack_endpoint}/", timeout=10)
     assert response.status_code in [200, 404], f"Llama Stack not accessible: {response.status_code}"
     print("✅ Backend connection established\n")
-    
+
     # Step 3: Check Llama Stack API endpoint
     print("🔌 Step 3: Checking Llama Stack API...")
     try:
-        response = requests.get(f"{LLAMA_STACK_ENDPOINT}/health", timeout=10)
+        response = requests.get(f"{llama_stack_endpoint}/health", timeout=10)
         if response.status_code == 200:
             print("✅ Llama Stack API is responding\n")
         else:
             print(f"ℹ️  Note: /health endpoint not available (status {response.status_code}), using root endpoint\n")
             # Try root endpoint as fallback
-            response = requests.get(f"{LLAMA_STACK_ENDPOINT}/", timeout=10)
+            response = requests.get(f"{llama_stack_endpoint}/", timeout=10)
             assert response.status_code in [200, 404], f"Llama Stack not accessible"
             print("✅ Llama Stack is accessible\n")
     except requests.exceptions.RequestException as e:
         print(f"⚠️  Health endpoint not available, trying root: {e}")
-        response = requests.get(f"{LLAMA_STACK_ENDPOINT}/", timeout=10)
+        response = requests.get(f"{llama_stack_endpoint}/", timeout=10)
         assert response.status_code in [200, 404], f"Llama Stack not accessible"
         print("✅ Llama Stack is accessible\n")
-    
-    # Step 4: Check if models are available
-    print("🤖 Step 4: Checking for available models...")
-    skip_inference = SKIP_MODEL_TESTS == "true"
-    model_available = False
-    
-    try:
-        # Llama-stack uses /v1/openai/v1/* paths for OpenAI-compatible API
-        openai_base_url = f"{LLAMA_STACK_ENDPOINT}/v1/openai/v1"
-        client = OpenAI(
-            api_key="not_needed",
-            base_url=openai_base_url,
-            timeout=30.0
-        )
-        
-        print(f"   DEBUG: Calling {openai_base_url}/models endpoint...")
-        models = client.models.list()
-        print(f"   DEBUG: Raw response type: {type(models)}")
-        print(f"   DEBUG: Number of models in response: {len(models.data)}")
-        
-        # Note: llama-stack models use 'identifier' not 'id'
-        model_ids = [getattr(model, 'identifier', getattr(model, 'id', None)) for model in models.data]
-        print(f"   DEBUG: Extracted model IDs: {model_ids}")
-        
-        model_count = len([m for m in model_ids if m])  # Count non-None models
-        
-        if model_count > 0:
-            print(f"   Found {model_count} model(s): {model_ids}")
-            
-            # Llama-stack returns models in format: "provider-id/model-id"
-            # Check both exact match and substring match
-            model_available = any(
-                INFERENCE_MODEL == mid or 
-                INFERENCE_MODEL in mid or 
-                mid.endswith(f"/{INFERENCE_MODEL}")
-                for mid in model_ids if mid
-            )
-            
-            if model_available:
-                matching_model = next((mid for mid in model_ids if INFERENCE_MODEL == mid or INFERENCE_MODEL in mid), None)
-                print(f"   ✅ Target model '{INFERENCE_MODEL}' is available (as '{matching_model}')")
-            else:
-                print(f"   ⚠️  Target model '{INFERENCE_MODEL}' not found, but {model_count} other(s) available")
-        else:
-            print(f"   ⚠️  No models returned from llama-stack")
-            print(f"   This suggests llama-stack didn't load the model configuration")
-        
-        print("✅ OpenAI-compatible API works\n")
-    except Exception as e:
-        print(f"   ❌ Model API check failed: {e}")
-        print(f"   DEBUG: Exception type: {type(e).__name__}")
-        if hasattr(e, 'response'):
-            print(f"   DEBUG: Response status: {e.response.status_code if hasattr(e.response, 'status_code') else 'N/A'}")
-            print(f"   DEBUG: Response body: {e.response.text if hasattr(e.response, 'text') else 'N/A'}")
-        print("   Suggestion: Check llama-stack pod logs for model registration errors\n")
-    
-    # Auto-detect: skip if explicitly set to true, or if auto and no model available
-    if SKIP_MODEL_TESTS == "true" or (SKIP_MODEL_TESTS == "auto" and not model_available):
-        skip_inference = True
-        print("⏭️  Skipping model inference tests\n")
-        if not model_available:
-            print("   Reason: No models available (configure llm-service for full tests)\n")
-    elif model_available:
-        skip_inference = False
-        print("🧪 Will run model inference tests...\n")
-    
-    # Determine the actual model ID to use for API calls
-    # Llama-stack may return models in "provider-id/model-id" format
-    actual_model_id = INFERENCE_MODEL
-    if model_available and model_ids:
-        # Find the matching model and use its full identifier
-        matching_model = next((mid for mid in model_ids if mid and (INFERENCE_MODEL == mid or INFERENCE_MODEL in mid)), None)
-        if matching_model:
-            actual_model_id = matching_model
-            print(f"   Using model ID: '{actual_model_id}' for API calls\n")
-    
-    # Step 5: Check UI health endpoint (Streamlit health check)
-    print("🏥 Step 5: Checking application health...")
+
+    # Step 4: Check UI health endpoint (Streamlit health check)
+    print("🏥 Step 4: Checking application health...")
     try:
-        health_response = requests.get(f"{RAG_UI_ENDPOINT}/_stcore/health", timeout=5)
+        health_response = requests.get(f"{rag_ui_endpoint}/_stcore/health", timeout=5)
         if health_response.status_code == 200:
             print("✅ Streamlit health check passed\n")
         else:
             print(f"⚠️  Health endpoint returned {health_response.status_code}, but app is functional\n")
-    except:
+    except requests.exceptions.RequestException:
         print("⚠️  Health endpoint not accessible, but app is functional\n")
-    
-    # Step 6 & 7: Run inference tests if models are available
-    chat_passed = False
-    rag_passed = False
-    
-    if not skip_inference and model_available:
-        print("🤖 Running inference tests with available model...\n")
-        
-        # Test chat completion using the full model identifier
-        chat_passed = test_chat_completion(client, actual_model_id, skip_inference)
-        
-        # Test RAG query (basic) using the full model identifier
-        rag_passed = test_rag_query_with_vector_db(client, actual_model_id, skip_inference)
-    
+
     print("="*80)
-    
-    # Determine if test should pass or fail
-    test_passed = True
-    failure_reasons = []
-    
-    # If SKIP_MODEL_TESTS is explicitly false, inference MUST work
-    if SKIP_MODEL_TESTS == "false":
-        if not model_available:
-            test_passed = False
-            failure_reasons.append("SKIP_MODEL_TESTS=false but no models available")
-        elif not chat_passed:
-            test_passed = False
-            failure_reasons.append("Chat completion test failed")
-    
-    if test_passed:
-        print("✅ E2E TEST COMPLETED!")
-    else:
-        print("❌ E2E TEST FAILED!")
-    
+    print("✅ E2E TEST COMPLETED!")
     print("="*80 + "\n")
-    print("Summary:")
-    print("  ✓ RAG UI is accessible and healthy")
-    print("  ✓ Llama Stack backend is operational")
-    print("  ✓ API endpoints are responding")
-    print("  ✓ Core infrastructure is working")
-    
+
+
+def test_chat_completion(client, model_id, skip_inference):
+    """Test chat completion with available model"""
     if skip_inference:
-        print("  ⏭️  Model inference tests skipped (no models available)")
-    else:
-        if chat_passed:
-            print("  ✓ Chat completion test passed")
-        else:
-            print("  ❌ Chat completion test failed or skipped")
-        
-        if rag_passed:
-            print("  ✓ RAG query test passed")
-        else:
-            print("  ⚠️  RAG query test skipped (needs vector DB)")
-    
-    print()
-    
-    if failure_reasons:
-        print("Failures:")
-        for reason in failure_reasons:
-            print(f"  ❌ {reason}")
-        print()
-    
-    if not model_available:
-        if SKIP_MODEL_TESTS == "false":
-            print("ERROR: Model inference was required but models are not available!")
-            print("       Check llama-stack configuration and model registration.")
-        else:
-            print("Note: No models were configured for this test.")
-            print("      For full inference testing, use values-e2e-maas.yaml with MaaS.")
-    else:
-        print(f"Note: Tests used model '{INFERENCE_MODEL}' via MaaS")
-        print("      Inference tests validate core RAG functionality.")
-        print()
-        print("Limitations in Kind:")
-        print("  • Document ingestion requires OpenShift (disabled)")
-        print("  • Vector DB auto-creation requires OpenShift (disabled)")
-        print("  • Full RAG pipeline testing requires OpenShift environment")
-        print()
-        print("What we tested:")
-        print("  ✓ MaaS connectivity and authentication")
-        print("  ✓ Model inference with real LLM")
-        print("  ✓ Multi-message context handling")
-        print("  ✓ Token usage tracking")
-    print()
-    
-    # Exit with appropriate code
-    if not test_passed:
-        raise AssertionError(f"E2E test failed: {', '.join(failure_reasons)}")
+        pytest.skip("Model inference tests skipped (no models available)")
+
+    print("\n" + "="*80)
+    print("💬 CHAT COMPLETION TEST")
+    print("="*80)
 
+    test_message = "Say 'Hello from RAG e2e test!' in one short sentence."
 
-def main():
-    """Main test execution"""
-    print("\n🚀 Starting E2E test for RAG application...")
-    print(f"📍 Configuration:")
-    print(f"   - Llama Stack: {LLAMA_STACK_ENDPOINT}")
-    print(f"   - RAG UI: {RAG_UI_ENDPOINT}")
-    print(f"   - Model: {INFERENCE_MODEL}")
-    print(f"   - Skip Model Tests: {SKIP_MODEL_TESTS}")
-    
-    try:
-        test_complete_rag_workflow()
-        print("✅ E2E test completed successfully!")
-        sys.exit(0)
-    except AssertionError as e:
-        print(f"\n❌ Test assertion failed: {str(e)}")
-        sys.exit(1)
-    except KeyboardInterrupt:
-        print("\n\n⚠️  Test interrupted by user")
-        sys.exit(130)
-    except Exception as e:
-        print(f"\n❌ Test execution failed: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    print(f"\n📤 Sending chat completion request:")
+    print(f"   Model: {model_id}")
+    print(f"   User Query: \"{test_message}\"")
+
+    response = client.chat.completions.create(
+        model=model_id,
+        messages=[
+            {"role": "user", "content": test_message}
+        ],
+        max_tokens=50,
+        temperature=0.7
+    )
+
+    content = response.choices[0].message.content
+    assert content, "No response content from model"
 
+    print("\n📥 Response received:")
+    print(f"   Content: \"{content}\"")
+    print(f"\n📊 Token usage:")
+    print(f"   Prompt tokens: {response.usage.prompt_tokens}")
+    print(f"   Completion tokens: {response.usage.completion_tokens}")
+    print(f"   Total tokens: {response.usage.total_tokens}")
+    print(f"\n✅ Chat completion test PASSED")
+    print("="*80 + "\n")
+
+
+def test_rag_query_with_vector_db(client, llama_stack_client, model_id, skip_inference, vector_db_id):
+    """Test RAG query against the session vector DB
+
+    The vector_db_id fixture registers and populates the database once per
+    session, so this test only retrieves context and runs the query.
+    """
+    if skip_inference:
+        pytest.skip("Model inference tests skipped (no models available)")
+
+    print("\n" + "="*80)
+    print("🔍 RAG WITH VECTOR DB TEST")
+    print("="*80)
+
+    # Test RAG query
+    test_query = "What is the height of the Eiffel Tower? Give just the number."
+
+    print(f"\n📚 Retrieving context from vector DB: {vector_db_id}")
+    rag_response = llama_stack_client.tool_runtime.rag_tool.query(
+        content=test_query,
+        vector_db_ids=[vector_db_id],
+    )
+    expected_context = str(rag_response.content)
+    assert expected_context, "RAG tool returned no context"
+
+    print(f"\n📤 Sending RAG query:")
+    print(f"   Model: {model_id}")
+    print(f"   User Query: \"{test_query}\"")
+    print(f"   Context Provided: \"{expected_context[:200]}...\"")
 
-if __name__ == "__main__":
-    main()
+    # Use OpenAI client for compatibility
+    response = client.chat.completions.create(
+        model=model_id,
+        messages=[
+            {"role": "system", "content": f"You are a helpful assistant. Answer based on the provided context. Context: {expected_context}"},
+            {"role": "user", "content": test_query}
+        ],
+        max_tokens=50,
+        temperature=0.1
+    )
 
+    content = response.choices[0].message.content
+    assert content, "No response content from model"
+
+    print("\n📥 RAG response received:")
+    print(f"   Content: \"{content}\"")
+
+    # Check if response contains the answer
+    print(f"\n🔎 Validating response:")
+    print(f"   Expected answer: '330 metres'")
+    if "330" in content:
+        print(f"\n✅ RAG test PASSED - Model successfully retrieved context information!")
+    else:
+        print(f"\n⚠️  Response didn't contain expected answer")
+        print("   Note: Vector DB creation and query flow worked, but response accuracy needs review")
+        print("✅ Basic RAG flow validated (vector DB creation and querying works)")
+    print("="*80 + "\n")
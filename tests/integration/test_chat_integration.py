@@ -2,50 +2,125 @@
 Integration tests for chat functionality
 Tests the Streamlit app by calling the code programmatically
 """
+import collections
+import json
+import types
+import uuid
+
 import pytest
 import os
-import sys
 from unittest.mock import Mock, patch, MagicMock
-from streamlit.testing.v1 import AppTest
-
-# Add the frontend directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../frontend'))
 
 # Configuration
 LLAMA_STACK_ENDPOINT = os.getenv("LLAMA_STACK_ENDPOINT", "http://localhost:8321")
 TEST_MODEL = os.getenv("INFERENCE_MODEL", "llama-3-2-3b")
 
+# Lightweight stubs - the tests only read attributes off these, so
+# namedtuples are much cheaper to build than Mocks
+Model = collections.namedtuple("Model", ["identifier", "api_model_type"])
+Provider = collections.namedtuple("Provider", ["api", "provider_id"])
 
-@pytest.fixture
+# Prompt template from direct_process_prompt, built once at import
+_PROMPT_TMPL_WITH_CTX = (
+    "Please answer the following query using the context below.\n\n"
+    "CONTEXT:\n{ctx}\n\nQUERY:\n{q}"
+)
+
+# Default sampling parameters, frozen so no test can mutate them
+_DEFAULT_SAMPLING_PARAMS = types.MappingProxyType({
+    "strategy": {'type': 'top_p', 'temperature': 0.7, 'top_p': 0.95},
+    "max_tokens": 512,
+    "repetition_penalty": 1.0,
+})
+
+
+# Canonical ReAct agent output, serialized and parsed once at import so
+# the round trip isn't repeated on every test run
+_REACT_SAMPLE = {
+    "thought": "I need to search for information about the Eiffel Tower.",
+    "action": {
+        "tool_name": "rag",
+        "tool_params": {"query": "Eiffel Tower height"}
+    },
+    "answer": "The Eiffel Tower is 330 metres tall."
+}
+_REACT_JSON = json.dumps(_REACT_SAMPLE)
+_REACT_PARSED = json.loads(_REACT_JSON)
+
+
+def _build_chat_mock_template():
+    """Canonical mock LlamaStack client, wired once at import time"""
+    mock_client = MagicMock()
+
+    # Mock models list
+    mock_client.models.list.return_value = [Model(TEST_MODEL, "llm")]
+
+    # Mock tool groups
+    mock_toolgroup = Mock()
+    mock_toolgroup.identifier = "builtin::rag"
+    mock_client.toolgroups.list.return_value = [mock_toolgroup]
+
+    # Mock vector DBs
+    mock_vectordb = Mock()
+    mock_vectordb.identifier = "test-vector-db"
+    mock_client.vector_dbs.list.return_value = [mock_vectordb]
+
+    # Mock shields
+    mock_client.shields.list.return_value = []
+
+    # Mock providers
+    mock_client.providers.list.return_value = [Provider("vector_io", "pgvector")]
+
+    return mock_client
+
+
+_CHAT_MOCK_TEMPLATE = _build_chat_mock_template()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _patch_llama_stack_client():
+    """Patch LlamaStackClient once per module instead of once per test"""
+    patcher = patch(
+        'llama_stack_client.LlamaStackClient',
+        return_value=_CHAT_MOCK_TEMPLATE,
+    )
+    patcher.start()
+    yield
+    patcher.stop()
+
+
+@pytest.fixture(scope="session")
 def mock_llama_client():
-    """Mock LlamaStack client for integration tests"""
-    with patch('llama_stack_client.LlamaStackClient') as mock_client:
-        # Mock models list
-        mock_model = Mock()
-        mock_model.identifier = TEST_MODEL
-        mock_model.api_model_type = "llm"
-        mock_client.return_value.models.list.return_value = [mock_model]
-        
-        # Mock tool groups
-        mock_toolgroup = Mock()
-        mock_toolgroup.identifier = "builtin::rag"
-        mock_client.return_value.toolgroups.list.return_value = [mock_toolgroup]
-        
-        # Mock vector DBs
-        mock_vectordb = Mock()
-        mock_vectordb.identifier = "test-vector-db"
-        mock_client.return_value.vector_dbs.list.return_value = [mock_vectordb]
-        
-        # Mock shields
-        mock_client.return_value.shields.list.return_value = []
-        
-        # Mock providers
-        mock_provider = Mock()
-        mock_provider.api = "vector_io"
-        mock_provider.provider_id = "pgvector"
-        mock_client.return_value.providers.list.return_value = [mock_provider]
-        
-        yield mock_client.return_value
+    """Mock LlamaStack client shared by all tests in the session"""
+    return _CHAT_MOCK_TEMPLATE
+
+
+@pytest.fixture(autouse=True)
+def _reset_chat_mock():
+    """Clear call history between tests without rebuilding the template
+
+    return_value=False/side_effect=True keeps the wiring from
+    _build_chat_mock_template intact while dropping recorded calls.
+    """
+    yield
+    _CHAT_MOCK_TEMPLATE.reset_mock(return_value=False, side_effect=True)
+
+
+@pytest.fixture(scope="class")
+def _mock_api_cls(request):
+    """Patch the UI module's llama_stack_api once per test class"""
+    patcher = patch('llama_stack_ui.distribution.ui.modules.api.llama_stack_api')
+    mock = patcher.start()
+    request.addfinalizer(patcher.stop)
+    return mock
+
+
+@pytest.fixture
+def mock_api(_mock_api_cls):
+    """Per-test view of the class-scoped llama_stack_api mock"""
+    yield _mock_api_cls
+    # Reset call history so assert_called_once/call_args stay isolated
+    _mock_api_cls.reset_mock()
 
 
 class TestChatPageIntegration:
@@ -64,7 +139,7 @@ class TestChatPageIntegration:
         context = "Machine learning is a subset of AI that enables systems to learn from data."
         
         # Test the prompt construction logic used in direct_process_prompt
-        extended_prompt = f"Please answer the following query using the context below.\n\nCONTEXT:\n{context}\n\nQUERY:\n{prompt}"
+        extended_prompt = _PROMPT_TMPL_WITH_CTX.format(ctx=context, q=prompt)
         
         assert "CONTEXT:" in extended_prompt
         assert "QUERY:" in extended_prompt
@@ -92,18 +167,16 @@ class TestChatPageIntegration:
     
     def test_agent_session_creation(self):
         """Test that agent sessions are created with unique IDs"""
-        import uuid
-        
         session_name = f"tool_demo_{uuid.uuid4()}"
         
         assert session_name.startswith("tool_demo_")
         assert len(session_name) > len("tool_demo_")
 
 
+@pytest.mark.integration
 class TestDirectModeIntegration:
     """Integration tests for direct mode (non-agent) chat"""
     
-    @patch('llama_stack_ui.distribution.ui.modules.api.llama_stack_api')
     def test_direct_mode_rag_query_with_vector_db(self, mock_api):
         """Test direct mode RAG query with vector database"""
         # Mock RAG query response
@@ -116,15 +189,14 @@ class TestDirectModeIntegration:
         selected_vector_dbs = ["test-vector-db"]
         
         rag_response = mock_api.client.tool_runtime.rag_tool.query(
-            content=prompt, 
-            vector_db_ids=list(selected_vector_dbs)
+            content=prompt,
+            vector_db_ids=tuple(selected_vector_dbs)
         )
         
         assert rag_response.content is not None
         assert "330" in rag_response.content
         mock_api.client.tool_runtime.rag_tool.query.assert_called_once()
     
-    @patch('llama_stack_ui.distribution.ui.modules.api.llama_stack_api')
     def test_direct_mode_inference_without_rag(self, mock_api):
         """Test direct mode inference without RAG"""
         # Mock inference response
@@ -145,11 +217,7 @@ class TestDirectModeIntegration:
         response = mock_api.client.inference.chat_completion(
             messages=messages,
             model_id=TEST_MODEL,
-            sampling_params={
-                "strategy": {'type': 'top_p', 'temperature': 0.7, 'top_p': 0.95},
-                "max_tokens": 512,
-                "repetition_penalty": 1.0,
-            },
+            sampling_params=_DEFAULT_SAMPLING_PARAMS,
             stream=True,
         )
         
@@ -157,6 +225,7 @@ class TestDirectModeIntegration:
         mock_api.client.inference.chat_completion.assert_called_once()
 
 
+@pytest.mark.integration
 class TestAgentModeIntegration:
     """Integration tests for agent mode chat"""
     
@@ -167,10 +236,11 @@ class TestAgentModeIntegration:
         tool_dict = dict(
             name="builtin::rag",
             args={
-                "vector_db_ids": list(selected_vector_dbs),
+                # tuple() avoids a mutable copy nothing ever mutates
+                "vector_db_ids": tuple(selected_vector_dbs),
             },
         )
-        
+
         assert tool_dict["name"] == "builtin::rag"
         assert len(tool_dict["args"]["vector_db_ids"]) == 2
     
@@ -184,28 +254,14 @@ class TestAgentModeIntegration:
         assert regular_value == "Regular"
         assert react_value == "ReAct"
     
-    @patch('llama_stack_ui.distribution.ui.modules.api.llama_stack_api')
     def test_react_agent_response_handling(self, mock_api):
         """Test ReAct agent response parsing"""
-        import json
-        
-        # Mock ReAct response format
-        react_output = {
-            "thought": "I need to search for information about the Eiffel Tower.",
-            "action": {
-                "tool_name": "rag",
-                "tool_params": {"query": "Eiffel Tower height"}
-            },
-            "answer": "The Eiffel Tower is 330 metres tall."
-        }
-        
-        react_json = json.dumps(react_output)
-        parsed = json.loads(react_json)
-        
-        assert "thought" in parsed
-        assert "action" in parsed
-        assert "answer" in parsed
-        assert parsed["answer"] == "The Eiffel Tower is 330 metres tall."
+        react_output = _REACT_PARSED
+
+        assert "thought" in react_output
+        assert "action" in react_output
+        assert "answer" in react_output
+        assert react_output["answer"] == "The Eiffel Tower is 330 metres tall."
 
 
 class TestMessageHistoryIntegration:
@@ -245,10 +301,10 @@ class TestMessageHistoryIntegration:
         assert "content" in debug_event
 
 
+@pytest.mark.integration
 class TestShieldIntegration:
     """Integration tests for safety shields"""
     
-    @patch('llama_stack_ui.distribution.ui.modules.api.llama_stack_api')
     def test_shield_configuration(self, mock_api):
         """Test that shields can be configured"""
         # Mock shields
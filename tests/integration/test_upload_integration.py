@@ -2,41 +2,59 @@
 Integration tests for document upload functionality
 Tests the upload workflow programmatically
 """
+import base64
+import collections
+import functools
+import types
+
 import pytest
 import os
-import sys
 from unittest.mock import Mock, patch, MagicMock
 from io import BytesIO
 
-# Add the frontend directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../frontend'))
-
 # Configuration
 LLAMA_STACK_ENDPOINT = os.getenv("LLAMA_STACK_ENDPOINT", "http://localhost:8321")
 
+# Lightweight provider stub - the tests only read these two attributes, so a
+# namedtuple is much cheaper to build than a Mock
+Provider = collections.namedtuple("Provider", ["api", "provider_id"])
 
-@pytest.fixture
-def mock_llama_client():
-    """Mock LlamaStack client for upload tests"""
-    with patch('llama_stack_client.LlamaStackClient') as mock_client:
-        # Mock providers
-        mock_provider = Mock()
-        mock_provider.api = "vector_io"
-        mock_provider.provider_id = "pgvector"
-        mock_client.return_value.providers.list.return_value = [mock_provider]
-        
-        # Mock vector DB registration
-        mock_client.return_value.vector_dbs.register.return_value = None
-        
-        # Mock document insertion
-        mock_client.return_value.tool_runtime.rag_tool.insert.return_value = None
-        
-        yield mock_client.return_value
+
+def _find_vector_io_provider(providers):
+    """Return the first vector_io provider id, mirroring the upload page logic"""
+    return next((p.provider_id for p in providers if p.api == "vector_io"), None)
+
+
+@functools.lru_cache(maxsize=None)
+def _make_data_url(content: bytes, mime: str) -> str:
+    """Build a data URL, caching the base64 encoding across tests"""
+    return f"data:{mime};base64,{base64.b64encode(content).decode()}"
+
+
+@pytest.fixture(scope="class")
+def _mock_api_cls(request):
+    """Patch the upload page's llama_stack_api once per test class"""
+    patcher = patch('llama_stack_ui.distribution.ui.page.upload.upload.llama_stack_api')
+    mock = patcher.start()
+    request.addfinalizer(patcher.stop)
+    return mock
 
 
 @pytest.fixture
+def mock_api(_mock_api_cls):
+    """Per-test view of the class-scoped llama_stack_api mock"""
+    yield _mock_api_cls
+    # Reset call history so assert_called_once/call_args stay isolated
+    _mock_api_cls.reset_mock()
+
+
+@pytest.fixture(scope="module")
 def mock_uploaded_file():
-    """Create a mock uploaded file"""
+    """Create a mock uploaded file
+
+    Module-scoped: the consuming tests only read name/type/size/read,
+    so one Mock per module is enough.
+    """
     mock_file = Mock()
     mock_file.name = "test_document.txt"
     mock_file.type = "text/plain"
@@ -45,19 +63,23 @@ def mock_uploaded_file():
     return mock_file
 
 
+@pytest.mark.integration
 class TestDocumentUploadIntegration:
     """Integration tests for document upload workflow"""
     
-    @patch('llama_stack_ui.distribution.ui.page.upload.upload.llama_stack_api')
     def test_single_file_upload_workflow(self, mock_api, mock_uploaded_file):
         """Test complete workflow for uploading a single file"""
         from llama_stack_client import RAGDocument
         
         # Setup mock
         mock_api.client.providers.list.return_value = [
-            Mock(api="vector_io", provider_id="pgvector")
+            Provider("vector_io", "pgvector")
         ]
         
+        # Bind the leaf mocks once instead of re-walking the MagicMock chain
+        register = mock_api.client.vector_dbs.register
+        insert = mock_api.client.tool_runtime.rag_tool.insert
+        
         vector_db_name = "test_vector_db"
         
         # Step 1: Create RAGDocument
@@ -70,16 +92,12 @@ class TestDocumentUploadIntegration:
         assert document['document_id'] == "test_document.txt"
         
         # Step 2: Find vector IO provider
-        providers = mock_api.client.providers.list()
-        vector_io_provider = None
-        for provider in providers:
-            if provider.api == "vector_io":
-                vector_io_provider = provider.provider_id
-        
+        vector_io_provider = _find_vector_io_provider(mock_api.client.providers.list())
+
         assert vector_io_provider == "pgvector"
         
         # Step 3: Register vector DB
-        mock_api.client.vector_dbs.register(
+        register(
             vector_db_id=vector_db_name,
             embedding_dimension=384,
             embedding_model="all-MiniLM-L6-v2",
@@ -87,31 +105,31 @@ class TestDocumentUploadIntegration:
         )
         
         # Step 4: Insert documents
-        mock_api.client.tool_runtime.rag_tool.insert(
+        insert(
             vector_db_id=vector_db_name,
             documents=[document],
             chunk_size_in_tokens=512,
         )
         
         # Verify calls
-        mock_api.client.vector_dbs.register.assert_called_once()
-        mock_api.client.tool_runtime.rag_tool.insert.assert_called_once()
+        register.assert_called_once()
+        insert.assert_called_once()
     
-    @patch('llama_stack_ui.distribution.ui.page.upload.upload.llama_stack_api')
     def test_multiple_files_upload_workflow(self, mock_api):
         """Test uploading multiple files at once"""
         from llama_stack_client import RAGDocument
         
         # Setup mock
         mock_api.client.providers.list.return_value = [
-            Mock(api="vector_io", provider_id="pgvector")
+            Provider("vector_io", "pgvector")
         ]
         
-        # Create mock files
+        # Create mock files. Mock(name=...) names the mock itself rather than
+        # setting a .name attribute, so use plain namespaces instead
         mock_files = [
-            Mock(name="doc1.txt"),
-            Mock(name="doc2.pdf"),
-            Mock(name="doc3.docx"),
+            types.SimpleNamespace(name="doc1.txt"),
+            types.SimpleNamespace(name="doc2.pdf"),
+            types.SimpleNamespace(name="doc3.docx"),
         ]
         
         # Create documents
@@ -126,129 +144,128 @@ class TestDocumentUploadIntegration:
         assert len(documents) == 3
         
         # Insert documents
+        insert = mock_api.client.tool_runtime.rag_tool.insert
         vector_db_name = "multi_file_db"
-        mock_api.client.tool_runtime.rag_tool.insert(
+        insert(
             vector_db_id=vector_db_name,
             documents=documents,
             chunk_size_in_tokens=512,
         )
         
-        # Verify insertion called with correct number of documents
-        call_args = mock_api.client.tool_runtime.rag_tool.insert.call_args
-        assert len(call_args[1]['documents']) == 3
+        # One call checks the invocation and every argument at once
+        insert.assert_called_once_with(
+            vector_db_id=vector_db_name,
+            documents=documents,
+            chunk_size_in_tokens=512,
+        )
     
-    def test_supported_file_types(self):
+    @pytest.mark.parametrize("file_type", ["txt", "pdf", "doc", "docx"])
+    def test_supported_file_types(self, file_type):
         """Test that all supported file types are handled"""
-        supported_types = ["txt", "pdf", "doc", "docx"]
-        
-        # Test each file type
-        for file_type in supported_types:
-            filename = f"test.{file_type}"
-            assert filename.endswith(f".{file_type}")
-    
-    def test_file_type_validation(self):
+        filename = f"test.{file_type}"
+        assert filename.endswith(f".{file_type}")
+
+    @pytest.mark.parametrize("filename, expected_valid", [
+        ("document.txt", True),
+        ("paper.pdf", True),
+        ("report.doc", True),
+        ("essay.docx", True),
+        # Invalid files would be rejected by file_uploader
+        ("image.jpg", False),
+        ("script.py", False),
+        ("data.csv", False),
+    ])
+    def test_file_type_validation(self, filename, expected_valid):
         """Test file type validation logic"""
         supported_types = ["txt", "pdf", "doc", "docx"]
-        
-        # Valid files
-        valid_files = ["document.txt", "paper.pdf", "report.doc", "essay.docx"]
-        for filename in valid_files:
-            extension = filename.split('.')[-1]
-            assert extension in supported_types
-        
-        # Invalid files would be rejected by file_uploader
-        invalid_files = ["image.jpg", "script.py", "data.csv"]
-        for filename in invalid_files:
-            extension = filename.split('.')[-1]
-            assert extension not in supported_types
+
+        extension = filename.split('.')[-1]
+        assert (extension in supported_types) == expected_valid
 
 
+@pytest.mark.integration
 class TestVectorDBCreation:
     """Integration tests for vector database creation"""
     
-    @patch('llama_stack_ui.distribution.ui.page.upload.upload.llama_stack_api')
     def test_vector_db_registration_params(self, mock_api):
         """Test vector DB registration with correct parameters"""
         mock_api.client.providers.list.return_value = [
-            Mock(api="vector_io", provider_id="pgvector")
+            Provider("vector_io", "pgvector")
         ]
         
         vector_db_id = "integration_test_db"
         
-        mock_api.client.vector_dbs.register(
+        register = mock_api.client.vector_dbs.register
+        register(
             vector_db_id=vector_db_id,
             embedding_dimension=384,
             embedding_model="all-MiniLM-L6-v2",
             provider_id="pgvector",
         )
         
-        call_args = mock_api.client.vector_dbs.register.call_args
-        assert call_args[1]['vector_db_id'] == vector_db_id
-        assert call_args[1]['embedding_dimension'] == 384
-        assert call_args[1]['embedding_model'] == "all-MiniLM-L6-v2"
-        assert call_args[1]['provider_id'] == "pgvector"
+        register.assert_called_once_with(
+            vector_db_id=vector_db_id,
+            embedding_dimension=384,
+            embedding_model="all-MiniLM-L6-v2",
+            provider_id="pgvector",
+        )
     
-    @patch('llama_stack_ui.distribution.ui.page.upload.upload.llama_stack_api')
     def test_vector_db_with_custom_name(self, mock_api):
         """Test creating vector DB with custom name"""
         mock_api.client.providers.list.return_value = [
-            Mock(api="vector_io", provider_id="pgvector")
+            Provider("vector_io", "pgvector")
         ]
         
         custom_name = "my_custom_documents"
         
-        mock_api.client.vector_dbs.register(
+        register = mock_api.client.vector_dbs.register
+        register(
             vector_db_id=custom_name,
             embedding_dimension=384,
             embedding_model="all-MiniLM-L6-v2",
             provider_id="pgvector",
         )
         
-        call_args = mock_api.client.vector_dbs.register.call_args
-        assert call_args[1]['vector_db_id'] == custom_name
+        register.assert_called_once_with(
+            vector_db_id=custom_name,
+            embedding_dimension=384,
+            embedding_model="all-MiniLM-L6-v2",
+            provider_id="pgvector",
+        )
 
 
+@pytest.mark.integration
 class TestProviderDetection:
     """Integration tests for provider detection"""
     
-    @patch('llama_stack_ui.distribution.ui.page.upload.upload.llama_stack_api')
     def test_vector_io_provider_detection(self, mock_api):
         """Test that vector_io provider is correctly detected"""
         mock_api.client.providers.list.return_value = [
-            Mock(api="inference", provider_id="ollama"),
-            Mock(api="vector_io", provider_id="pgvector"),
-            Mock(api="memory", provider_id="redis"),
+            Provider("inference", "ollama"),
+            Provider("vector_io", "pgvector"),
+            Provider("memory", "redis"),
         ]
         
-        providers = mock_api.client.providers.list()
-        vector_io_provider = None
-        for provider in providers:
-            if provider.api == "vector_io":
-                vector_io_provider = provider.provider_id
-        
+        vector_io_provider = _find_vector_io_provider(mock_api.client.providers.list())
+
         assert vector_io_provider == "pgvector"
     
-    @patch('llama_stack_ui.distribution.ui.page.upload.upload.llama_stack_api')
     def test_no_vector_io_provider(self, mock_api):
         """Test handling when no vector_io provider is available"""
         mock_api.client.providers.list.return_value = [
-            Mock(api="inference", provider_id="ollama"),
-            Mock(api="memory", provider_id="redis"),
+            Provider("inference", "ollama"),
+            Provider("memory", "redis"),
         ]
         
-        providers = mock_api.client.providers.list()
-        vector_io_provider = None
-        for provider in providers:
-            if provider.api == "vector_io":
-                vector_io_provider = provider.provider_id
-        
+        vector_io_provider = _find_vector_io_provider(mock_api.client.providers.list())
+
         assert vector_io_provider is None
 
 
+@pytest.mark.integration
 class TestDocumentInsertion:
     """Integration tests for document insertion into vector DB"""
     
-    @patch('llama_stack_ui.distribution.ui.page.upload.upload.llama_stack_api')
     def test_document_insertion_with_chunks(self, mock_api):
         """Test document insertion with chunking"""
         from llama_stack_client import RAGDocument
@@ -263,16 +280,19 @@ class TestDocumentInsertion:
         chunk_size = 512
         vector_db_id = "test_db"
         
-        mock_api.client.tool_runtime.rag_tool.insert(
+        insert = mock_api.client.tool_runtime.rag_tool.insert
+        insert(
+            vector_db_id=vector_db_id,
+            documents=documents,
+            chunk_size_in_tokens=chunk_size,
+        )
+
+        insert.assert_called_once_with(
             vector_db_id=vector_db_id,
             documents=documents,
             chunk_size_in_tokens=chunk_size,
         )
-        
-        call_args = mock_api.client.tool_runtime.rag_tool.insert.call_args
-        assert call_args[1]['chunk_size_in_tokens'] == 512
     
-    @patch('llama_stack_ui.distribution.ui.page.upload.upload.llama_stack_api')
     def test_empty_document_list(self, mock_api):
         """Test handling of empty document list"""
         documents = []
@@ -292,28 +312,24 @@ class TestDocumentInsertion:
         mock_api.client.tool_runtime.rag_tool.insert.assert_not_called()
 
 
+@pytest.mark.fast
 class TestDataURLConversion:
     """Integration tests for file to data URL conversion"""
     
     def test_data_url_format(self):
         """Test that data URLs have correct format"""
         # Simulate data URL creation
-        content = "Hello, World!"
-        import base64
-        encoded = base64.b64encode(content.encode()).decode()
-        data_url = f"data:text/plain;base64,{encoded}"
+        content = b"Hello, World!"
+        data_url = _make_data_url(content, "text/plain")
         
         assert data_url.startswith("data:")
         assert ";base64," in data_url
-        assert encoded in data_url
+        assert base64.b64encode(content).decode() in data_url
     
     def test_pdf_data_url(self):
         """Test data URL for PDF files"""
-        import base64
-        
         pdf_content = b"%PDF-1.4 test content"
-        encoded = base64.b64encode(pdf_content).decode()
-        data_url = f"data:application/pdf;base64,{encoded}"
+        data_url = _make_data_url(pdf_content, "application/pdf")
         
         assert data_url.startswith("data:application/pdf")
         assert ";base64," in data_url
@@ -0,0 +1,18 @@
+"""
+Shared setup for the unit tests
+
+The streamlit stub used to live at the top of test_upload.py and re-ran
+for every collected module; hoisting it here runs it once per session.
+The stub is only installed when streamlit is not importable, so running
+the unit and integration suites together still binds the UI modules to
+the real package. The frontend directory itself comes from the
+pythonpath setting in pytest.ini.
+"""
+import sys
+from unittest.mock import MagicMock
+
+# Mock streamlit before the upload tests import anything that uses it
+try:
+    import streamlit  # noqa: F401
+except ImportError:
+    sys.modules['streamlit'] = MagicMock()
@@ -5,48 +5,50 @@ Tests individual functions and logic without requiring Streamlit runtime
 Note: We test the core logic inline rather than importing from chat.py
 because chat.py executes Streamlit code at module level.
 """
+import types
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 
+# Prompt templates from direct_process_prompt, built once at import.
+# str.format templates are cheaper than rebuilding f-strings per test.
+_PROMPT_TMPL_WITH_CTX = (
+    "Please answer the following query using the context below.\n\n"
+    "CONTEXT:\n{ctx}\n\nQUERY:\n{q}"
+)
+_PROMPT_TMPL_NO_CTX = "Please answer the following query. \n\nQUERY:\n{q}"
+
+
+# The greedy strategy has no parameters, so return one immutable constant
+# instead of allocating a fresh dict on every call
+_GREEDY = types.MappingProxyType({'type': 'greedy'})
+
 
 # Recreate the get_strategy function logic for testing
 def get_strategy(temperature, top_p):
     """Determines the sampling strategy for the LLM based on temperature."""
-    return {'type': 'greedy'} if temperature == 0 else {
+    return _GREEDY if temperature == 0 else {
             'type': 'top_p', 'temperature': temperature, 'top_p': top_p
         }
 
 
+@pytest.mark.fast
 class TestGetStrategy:
     """Test the get_strategy function for sampling parameters"""
-    
-    def test_greedy_strategy_when_temperature_is_zero(self):
-        """When temperature is 0, should return greedy strategy"""
-        strategy = get_strategy(temperature=0, top_p=0.95)
-        assert strategy == {'type': 'greedy'}
-    
-    def test_top_p_strategy_when_temperature_is_nonzero(self):
-        """When temperature > 0, should return top_p strategy with params"""
-        strategy = get_strategy(temperature=0.7, top_p=0.95)
-        assert strategy == {
-            'type': 'top_p',
-            'temperature': 0.7,
-            'top_p': 0.95
-        }
-    
-    def test_top_p_strategy_with_high_temperature(self):
-        """Test with high temperature value"""
-        strategy = get_strategy(temperature=1.5, top_p=0.9)
-        assert strategy['type'] == 'top_p'
-        assert strategy['temperature'] == 1.5
-        assert strategy['top_p'] == 0.9
-    
-    def test_top_p_strategy_with_low_top_p(self):
-        """Test with low top_p value"""
-        strategy = get_strategy(temperature=0.5, top_p=0.5)
-        assert strategy['top_p'] == 0.5
 
+    @pytest.mark.parametrize("temperature, top_p, expected", [
+        # Temperature 0 means greedy sampling
+        (0, 0.95, {'type': 'greedy'}),
+        (0.7, 0.95, {'type': 'top_p', 'temperature': 0.7, 'top_p': 0.95}),
+        (1.5, 0.9, {'type': 'top_p', 'temperature': 1.5, 'top_p': 0.9}),
+        (0.5, 0.5, {'type': 'top_p', 'temperature': 0.5, 'top_p': 0.5}),
+    ])
+    def test_get_strategy(self, temperature, top_p, expected):
+        """get_strategy picks greedy at temperature 0, top_p otherwise"""
+        assert get_strategy(temperature=temperature, top_p=top_p) == expected
 
+
+@pytest.mark.fast
 class TestChatMessageFormatting:
     """Test chat message formatting and handling"""
     
@@ -55,12 +57,10 @@ class TestChatMessageFormatting:
         prompt = "What is the Eiffel Tower?"
         context = "The Eiffel Tower is 330 metres tall."
         
-        expected_prompt = f"Please answer the following query using the context below.\n\nCONTEXT:\n{context}\n\nQUERY:\n{prompt}"
-        
         # Simulate the logic from direct_process_prompt
-        extended_prompt = f"Please answer the following query using the context below.\n\nCONTEXT:\n{context}\n\nQUERY:\n{prompt}"
+        extended_prompt = _PROMPT_TMPL_WITH_CTX.format(ctx=context, q=prompt)
         
-        assert extended_prompt == expected_prompt
+        assert extended_prompt == f"Please answer the following query using the context below.\n\nCONTEXT:\n{context}\n\nQUERY:\n{prompt}"
         assert "CONTEXT:" in extended_prompt
         assert "QUERY:" in extended_prompt
     
@@ -68,16 +68,15 @@ class TestChatMessageFormatting:
         """Test that direct mode correctly formats prompts without RAG context"""
         prompt = "Hello, how are you?"
         
-        expected_prompt = f"Please answer the following query. \n\nQUERY:\n{prompt}"
-        
         # Simulate the logic from direct_process_prompt
-        extended_prompt = f"Please answer the following query. \n\nQUERY:\n{prompt}"
+        extended_prompt = _PROMPT_TMPL_NO_CTX.format(q=prompt)
         
-        assert extended_prompt == expected_prompt
+        assert extended_prompt == f"Please answer the following query. \n\nQUERY:\n{prompt}"
         assert "CONTEXT:" not in extended_prompt
         assert "QUERY:" in extended_prompt
 
 
+@pytest.mark.fast
 class TestAgentType:
     """Test AgentType enum and agent configuration"""
     
@@ -91,6 +90,7 @@ class TestAgentType:
         assert react_value == "ReAct"
 
 
+@pytest.mark.fast
 class TestSystemPromptHandling:
     """Test system prompt construction"""
     
@@ -118,6 +118,7 @@ class TestSystemPromptHandling:
         assert updated_prompt.count('.') == 1
 
 
+@pytest.mark.fast
 class TestToolGroupSelection:
     """Test tool group selection and configuration"""
     